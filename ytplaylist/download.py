@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import glob
 import itertools
 import json
@@ -13,20 +14,37 @@ import subprocess
 import shutil
 import tempfile
 import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import timedelta
 from os import path
+from types import MappingProxyType
 from typing import IO, Iterator, Mapping, Optional, TypedDict
 
 import isodate  # type: ignore
 import requests
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import yt_dlp  # type: ignore
+except ImportError:
+    yt_dlp = None
+
 logging.basicConfig(
     format='%(levelname)s: %(message)s',
     level=logging.NOTSET,
 )
 logger = logging.getLogger(__name__)
 
+#: Shared HTTP session, reusing TLS connections across API requests
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=20))
+
 
 class LocalDBElement(TypedDict):
     """Typing for locale database item"""
@@ -36,8 +54,9 @@ class LocalDBElement(TypedDict):
     locale: dict[str, str]
 
 
+@functools.cache
 def get_api_key() -> Optional[str]:
-    """Get Youtube API key from environment"""
+    """Get Youtube API key from environment, warning once if unset"""
     try:
         return os.environ['YOUTUBE_API_KEY']
     except KeyError:
@@ -117,6 +136,10 @@ def get_parser() -> argparse.ArgumentParser:
         '--ytdl-extra', '-x', action='append', default=[],
         help="extra youtube-dl/youtube-dlp argument"
     )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=4,
+        help="number of parallel downloads, defaults to 4"
+    )
     parser.add_argument(
         'playlists', metavar='PLAYLIST', nargs='+',
         help="playlists to download"
@@ -124,9 +147,23 @@ def get_parser() -> argparse.ArgumentParser:
     return parser
 
 
+#: Map characters forbidden in file names to full-width look-alikes
+_SANITIZE_TABLE = str.maketrans({
+    '/': '∕',
+    '\\': '＼',
+    ':': '：',
+    '*': '＊',
+    '?': '？',
+    '"': '＂',
+    '<': '＜',
+    '>': '＞',
+    '|': '｜',
+})
+
+
 def sanitize_name(name: str):
     """Sanitize file name"""
-    return name.replace('/', '∕')
+    return name.translate(_SANITIZE_TABLE)
 
 
 @dataclass(frozen=True)
@@ -134,56 +171,39 @@ class VideoInfo():
     """Standard video information dataclass"""
     vid: str
     duration: timedelta
-    __title: str
-    __locale_title: frozenset[tuple[str, str]]
+    _title: str
+    _locale_title: Mapping[str, str]
     missing: bool
 
+    def __post_init__(self) -> None:
+        # Accepts any iterable of pairs, kept read-only for safety
+        object.__setattr__(self, '_locale_title',
+                           MappingProxyType(dict(self._locale_title)))
+
     def __hash__(self) -> int:
         return hash(self.vid)
 
     def __eq__(self, other: object) -> bool:
-        if isinstance(other, VideoInfo):
-            return hash(self) == hash(other)
-        return False
+        return isinstance(other, VideoInfo) and self.vid == other.vid
 
     def title(self, locale: str = None) -> str:
         """Get localized video title"""
         if locale is None:
-            return self.__title
-        iterator = iter(b for a, b in self.__locale_title if a == locale)
-        return next(iterator, self.__title)
-        # return self.__locale_title.get(locale, self.__title)
+            return self._title
+        return self._locale_title.get(locale, self._title)
 
     def export_db(self) -> LocalDBElement:
         """Create element ready to be exported to JSON database"""
         return {
             'id': self.vid,
             'duration': self.duration.seconds,
-            'title': self.__title,
-            'locale': dict(self.__locale_title),
-            # 'locale': self.__locale_title,
+            'title': self._title,
+            'locale': dict(self._locale_title),
         }
 
     @staticmethod
-    def from_youtube(vid: str) -> VideoInfo:
-        """Create from Youtube metadata"""
-        base_url = 'https://www.googleapis.com/youtube/v3/videos'
-        params = {
-            'key': get_api_key(),
-            'part': 'contentDetails,id,localizations,snippet',
-            'maxResults': 1,
-            'id': vid
-        }
-
-        logger.debug("Youtube request for info: %s", vid)
-        req = requests.get(base_url, params)
-        logger.debug("Got response for %s", req.url)
-        if not req.ok:
-            logger.error("Failed to send request %s for video %s", req, vid)
-            raise Exception(f"Request {req.url} failed")
-        data = req.json()
-        video = data['items'][0]
-
+    def _from_youtube_item(video: dict) -> VideoInfo:
+        """Create from a videos.list response item"""
         duration: timedelta = isodate.parse_duration(
             video['contentDetails']['duration']
         )
@@ -192,20 +212,54 @@ class VideoInfo():
         for locale, info in video.get('localizations', {}).items():
             locale_title[locale[:2]] = info['title']
 
-        return VideoInfo(vid, duration, title,
-                         frozenset(locale_title.items()), False)
+        return VideoInfo(video['id'], duration, title, locale_title, False)
+
+    @staticmethod
+    def from_youtube(vid: str) -> VideoInfo:
+        """Create from Youtube metadata"""
+        return VideoInfo.from_youtube_many([vid])[vid]
+
+    @staticmethod
+    def from_youtube_many(vids: list[str]) -> dict[str, VideoInfo]:
+        """Create from Youtube metadata, batching 50 IDs per request
+
+        Videos unknown to Youtube are absent from the returned dict.
+        """
+        base_url = 'https://www.googleapis.com/youtube/v3/videos'
+        infos: dict[str, VideoInfo] = {}
+
+        for start in range(0, len(vids), 50):
+            chunk = vids[start:start + 50]
+            params = {
+                'key': get_api_key(),
+                'part': 'contentDetails,id,localizations,snippet',
+                'maxResults': len(chunk),
+                'id': ','.join(chunk),
+            }
+
+            logger.debug("Youtube request for info: %s", chunk)
+            req = _SESSION.get(base_url, params=params)
+            logger.debug("Got response for %s", req.url)
+            if not req.ok:
+                logger.error("Failed to send request %s for videos %s",
+                             req, chunk)
+                raise Exception(f"Request {req.url} failed")
+            for video in req.json()['items']:
+                info = VideoInfo._from_youtube_item(video)
+                infos[info.vid] = info
+
+        return infos
 
     @staticmethod
     def from_local(item: LocalDBElement) -> VideoInfo:
         """Create from database item"""
         return VideoInfo(item['id'], timedelta(seconds=item['duration']),
-                         item['title'], frozenset(item['locale'].items()),
-                         False)
+                         item['title'], item['locale'], False)
 
     @staticmethod
     def from_missing(vid: str) -> VideoInfo:
         """Create placeholder for missing video"""
-        return VideoInfo(vid, timedelta(), vid, frozenset(), True)
+        return VideoInfo(vid, timedelta(), vid, {}, True)
 
 
 def m3u_get_ids(stream: IO[str], url: bool = False) -> Iterator[str]:
@@ -213,9 +267,10 @@ def m3u_get_ids(stream: IO[str], url: bool = False) -> Iterator[str]:
     logger.debug("Parsing M3U playlist")
 
     for line in stream:
-        if line[0] == '#':
+        if not line or line[0] == '#':
             continue
-        vid = path.basename(line).split('.')[0]
+        name = line.rstrip('\n').rpartition('/')[2]
+        vid = name.partition('.')[0]
         if url:
             vid = urllib.parse.unquote(vid)
         logger.debug("Found video %s", vid)
@@ -232,7 +287,7 @@ def m3u_create(
     """Write M3U playlist"""
     logger.debug("Creating M3U playlist")
 
-    stream.write('#EXTM3U\n')
+    out = ['#EXTM3U\n']
     for vidinfo, vid_path in items.items():
         if vid_path is None:
             logger.error("Video not found: %s", vidinfo)
@@ -244,26 +299,37 @@ def m3u_create(
             vid_path = path.relpath(vid_path, basepath)
         if url:
             vid_path = urllib.parse.quote(vid_path)
-        stream.writelines((
-            f'#EXTINF:{vidinfo.duration.seconds},{vidinfo.title(locale)}\n',
-            f'{vid_path}\n',
-        ))
+        out.append(
+            f'#EXTINF:{vidinfo.duration.seconds},{vidinfo.title(locale)}\n'
+            f'{vid_path}\n'
+        )
         logger.debug("M3U item: %s", vid_path)
+    stream.write(''.join(out))
+
+
+_ID_RE = re.compile(r'([A-Za-z0-9_\-]{8,})\.[a-z0-9]{1,4}$')
 
 
 def id_from_path(file: str) -> Optional[str]:
-    """Get youtube video ID from a file path"""
-    id_exp = r'([A-Za-z0-9_\-]{8,})\.[a-z0-9]{1,4}'
-    file = path.basename(path.realpath(file))
-    match = re.match(id_exp, file)
+    """Get youtube video ID from a file name
+
+    Does not resolve symlinks: the caller should pass the resolved
+    path if the file may be a link with an unrelated name.
+    """
+    match = _ID_RE.match(path.basename(file))
     if not match:
         return None
     return match.group(1)
 
 
-def listdir_abs(dir_: str) -> Iterator[str]:
-    """os.listdir but yields full paths"""
-    yield from (path.normpath(path.join(dir_, k)) for k in os.listdir(dir_))
+def scandir_abs(dir_: str) -> Iterator[os.DirEntry]:
+    """os.scandir but with absolute paths
+
+    DirEntry objects cache is_file/is_symlink/stat results, avoiding
+    one stat syscall per entry compared to os.listdir + os.path tests.
+    """
+    with os.scandir(path.abspath(dir_)) as entries:
+        yield from entries
 
 
 def youtube_get_ids(playlist_id: str) -> Iterator[str]:
@@ -280,7 +346,7 @@ def youtube_get_ids(playlist_id: str) -> Iterator[str]:
     }
 
     while True:
-        req = requests.get(base_url, params)
+        req = _SESSION.get(base_url, params=params)
         logger.debug("Got response for %s", req.url)
         if not req.ok:
             logger.error("Failed to send request %s for %s", req, playlist_id)
@@ -297,80 +363,146 @@ def youtube_get_ids(playlist_id: str) -> Iterator[str]:
         params['pageToken'] = data['nextPageToken']
 
 
-def create_symlinks_locale(videos: Mapping[VideoInfo, Optional[str]],
-                           dst: str, locale: str = None) -> None:
-    """Create symlinks with pretty names"""
-    def find_video_link(dir_: str, target: str) -> Iterator[str]:
-        """Find files which are symlinks pointing to target"""
-        for absfile in listdir_abs(dir_):
-            if path.isfile(absfile) and path.islink(absfile) \
-                    and path.realpath(absfile) == path.realpath(target):
-                yield absfile
+def youtube_get_ids_many(playlist_ids: list[str],
+                         max_workers: int = 4) -> Iterator[str]:
+    """Get video IDs from several YouTube playlists concurrently
+
+    Playlists are fetched in parallel but IDs are yielded in
+    playlist order, as youtube_get_ids would.
+    """
+    if len(playlist_ids) <= 1:
+        yield from itertools.chain.from_iterable(
+            map(youtube_get_ids, playlist_ids)
+        )
+        return
 
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from itertools.chain.from_iterable(
+            executor.map(
+                lambda pid: list(youtube_get_ids(pid)), playlist_ids
+            )
+        )
+
+
+#: Memoized realpath: files do not move while the program runs, and
+#: each raw file is resolved once per video per locale otherwise
+_realpath = functools.lru_cache(maxsize=4096)(path.realpath)
+
+
+def prepare_links_dir(dst: str) -> dict[str, list[str]]:
+    """Check a links directory content and index links by their target"""
     if not path.isdir(dst):
         os.mkdir(dst)
 
-    # Check dst directory content
-    for file in listdir_abs(dst):
-        if not path.islink(file) or id_from_path(file) is None:
-            logger.warning("Found non valid file: %s", file)
-        elif not path.exists(file):
-            logger.debug("Removing dead symlink: %s", file)
+    links_by_target: dict[str, list[str]] = defaultdict(list)
+    for entry in scandir_abs(dst):
+        if not entry.is_symlink():
+            logger.warning("Found non valid file: %s", entry.path)
+        elif not entry.is_file():
+            logger.debug("Removing dead symlink: %s", entry.path)
+        else:
+            target = _realpath(entry.path)
+            if id_from_path(target) is None:
+                logger.warning("Found non valid file: %s", entry.path)
+            else:
+                links_by_target[target].append(entry.path)
+    return links_by_target
+
+
+def create_symlink(vidinfo: VideoInfo, raw_path: str, dst: str,
+                   links_by_target: dict[str, list[str]],
+                   locale: str = None) -> None:
+    """Create the pretty name symlink for a single video
+
+    links_by_target is the index built by prepare_links_dir; it is
+    kept up to date so calling this again for a video is a no-op.
+    """
+    ext = path.basename(raw_path).removeprefix(f'{vidinfo.vid}.')
+    title_filename = sanitize_name(vidinfo.title(locale)) + f'.{ext}'
+
+    links = links_by_target.setdefault(_realpath(raw_path), [])
+    kept: list[str] = []
+    for link in links:
+        if path.basename(link) == title_filename:
+            logger.debug("Found video: %s = %s", vidinfo, link)
+            kept.append(link)
+        else:
+            logger.debug("Removing invalid link: %s", link)
+            os.unlink(link)
 
+    if not kept:
+        target = path.relpath(raw_path, dst)
+        name = f"{dst}/{title_filename}"
+        if path.islink(name):
+            logger.debug("Removing invalid link: %s", name)
+            os.unlink(name)
+        logger.debug("Creating link: %s -> %s", name, target)
+        os.symlink(target, name)
+        kept.append(name)
+    links[:] = kept
+
+
+def create_symlinks_locale(videos: Mapping[VideoInfo, Optional[str]],
+                           dst: str, locale: str = None) -> None:
+    """Create symlinks with pretty names"""
+    links_by_target = prepare_links_dir(dst)
     for vidinfo, raw_path in videos.items():
         if raw_path is None:
             logger.error("Video not found: %s", vidinfo)
             continue
-        ext = path.basename(raw_path).removeprefix(f'{vidinfo.vid}.')
-        title_filename = sanitize_name(vidinfo.title(locale)) + f'.{ext}'
-
-        found = 0
-        for link in find_video_link(dst, raw_path):
-            if path.basename(link) == title_filename:
-                logger.debug("Found video: %s = %s", vidinfo, link)
-                found += 1
-            else:
-                logger.debug("Removing invalid link: %s", link)
-                os.unlink(link)
+        create_symlink(vidinfo, raw_path, dst, links_by_target, locale)
 
-        if not found:
-            target = path.relpath(raw_path, dst)
-            name = f"{dst}/{title_filename}"
-            if path.islink(name):
-                logger.debug("Removing invalid link: %s", name)
-                os.unlink(name)
-            logger.debug("Creating link: %s -> %s", name, target)
-            os.symlink(target, name)
 
-
-def youtube_dl(vid: str, output_dir: str,
-               *args: str, audio_only: bool = False) -> None:
-    """Download a Youtube video"""
+def _ytdl_exe() -> str:
+    """Find the yt-dlp/youtube-dl executable"""
     if shutil.which('yt-dlp'):
-        exe = 'yt-dlp'
-    elif shutil.which('youtube-dl'):
-        exe = 'youtube-dl'
+        return 'yt-dlp'
+    if shutil.which('youtube-dl'):
+        return 'youtube-dl'
+    raise FileNotFoundError("Neither yt-dlp nor youtube-dl is found")
+
+
+def _ytdl_opts(exe: str, tmpdir: str, args: tuple[str, ...],
+               audio_only: bool) -> list[str]:
+    """Build the common yt-dlp/youtube-dl option list"""
+    opts = ['--ignore-errors', '--embed-subs', '--embed-thumbnail',
+            '--output', path.join(tmpdir, '%(id)s.%(ext)s')]
+    if audio_only:
+        opts.append('--extract-audio')
+    if exe == 'yt-dlp':
+        opts.extend(('--embed-metadata', '--embed-chapters'))
     else:
-        raise FileNotFoundError("Neither yt-dlp nor youtube-dl is found")
+        opts.append('--add-metadata')
+    opts.extend(args)
+    return opts
+
 
-    if not path.isdir(output_dir):
-        os.mkdir(output_dir)
+def youtube_dl(vid: str, output_dir: str,
+               *args: str, audio_only: bool = False) -> str:
+    """Download a Youtube video, returning the downloaded file path
+
+    Uses the yt_dlp Python API when importable, avoiding one
+    interpreter startup and extractor load per video; otherwise falls
+    back to running yt-dlp or youtube-dl as a subprocess.
+    """
+    exe = 'yt-dlp' if yt_dlp is not None else _ytdl_exe()
+
+    os.makedirs(output_dir, exist_ok=True)
 
     with tempfile.TemporaryDirectory(prefix='ytplaylist.') as tmpdir:
-        opts = [exe, '--ignore-errors', '--embed-subs', '--embed-thumbnail',
-                '--output', path.join(tmpdir, '%(id)s.%(ext)s')]
-        if audio_only:
-            opts.append('--extract-audio')
-        if exe == 'yt-dlp':
-            opts.extend(('--embed-metadata', '--embed-chapters'))
+        opts = _ytdl_opts(exe, tmpdir, args, audio_only)
+
+        if yt_dlp is not None:
+            logger.debug("Calling yt_dlp with: %s", opts)
+            ydl_opts = yt_dlp.parse_options(opts).ydl_opts
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ret = ydl.download([vid])
+            if ret:
+                raise subprocess.CalledProcessError(ret, [exe, vid])
         else:
-            opts.append('--add-metadata')
-        opts.extend(args)
-        opts.append('--')
-        opts.append(vid)
-
-        logger.debug("Calling: %s", opts)
-        subprocess.run(opts, capture_output=False, check=True)
+            cmd = [exe, *opts, '--', vid]
+            logger.debug("Calling: %s", cmd)
+            subprocess.run(cmd, capture_output=False, check=True)
 
         files = glob.glob(path.join(tmpdir, '*'))
         if not files:
@@ -387,14 +519,69 @@ def youtube_dl(vid: str, output_dir: str,
         new_name = path.join(output_dir, path.basename(file))
         shutil.move(file, new_name)
     logger.debug("Downloaded %s", new_name)
+    return new_name
+
 
+def youtube_dl_batch(vids: list[str], output_dir: str,
+                     *args: str, audio_only: bool = False) -> dict[str, str]:
+    """Download several Youtube videos with a single subprocess
 
-def read_db(db_path: str) -> list[VideoInfo]:
-    """Read database from JSON"""
-    with open(db_path, 'r', encoding='UTF-8') as stream:
+    One yt-dlp/youtube-dl invocation reads the whole video list from
+    stdin, amortizing the interpreter startup over the batch. Returns
+    the downloaded file paths by video ID; failed downloads are simply
+    absent from the result.
+    """
+    exe = _ytdl_exe()
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix='ytplaylist.') as tmpdir:
+        opts = [exe] + _ytdl_opts(exe, tmpdir, args, audio_only)
+        opts.extend(('--batch-file', '-'))
+
+        logger.debug("Calling: %s", opts)
+        subprocess.run(
+            opts,
+            input='\n'.join(f'https://youtu.be/{vid}' for vid in vids),
+            text=True, capture_output=False, check=False,
+        )
+
+        downloaded: dict[str, str] = {}
+        for file in glob.glob(path.join(tmpdir, '*')):
+            if path.basename(file).count('.') != 1:
+                continue
+            vid = id_from_path(file)
+            if vid is None:
+                logger.warning("Unexpected downloaded file: %s", file)
+                continue
+            new_name = path.join(output_dir, path.basename(file))
+            shutil.move(file, new_name)
+            downloaded[vid] = new_name
+            logger.debug("Downloaded %s", new_name)
+    return downloaded
+
+
+def read_db(db_path: str) -> dict[str, VideoInfo]:
+    """Read database from JSON, indexed by video ID"""
+    with open(db_path, 'rb') as stream:
         # TODO: type check json content
-        json_db: list[LocalDBElement] = json.load(stream)
-    return [VideoInfo.from_local(k) for k in json_db]
+        json_db: list[LocalDBElement]
+        if orjson is not None:
+            json_db = orjson.loads(stream.read())
+        else:
+            json_db = json.load(stream)
+    return {k['id']: VideoInfo.from_local(k) for k in json_db}
+
+
+def write_db(db_path: str, local_db: dict[str, VideoInfo]) -> None:
+    """Write database to JSON"""
+    db_export = [k.export_db() for k in local_db.values()]
+    if orjson is not None:
+        with open(db_path, 'wb') as stream:
+            stream.write(orjson.dumps(db_export, option=orjson.OPT_INDENT_2))
+    else:
+        with open(db_path, 'w', encoding='UTF-8') as stream:
+            json.dump(db_export, stream, indent=2)
 
 
 def main(argv: list[str] = None) -> None:
@@ -422,18 +609,21 @@ def main(argv: list[str] = None) -> None:
 
     logger.debug("Arguments: %s", args)
 
+    # Check for the API key up front rather than on the first request
+    get_api_key()
+
     output = abspath_default_suffix(args.output)
     output_raw = abspath_default_suffix(args.output_raw, output, '-raw')
     output_locale = abspath_default_suffix(args.output_locale,
                                            output, '-%(locale)s')
 
     # Read local database
-    local_db: list[VideoInfo]
+    local_db: dict[str, VideoInfo]
     if args.local_db is not None:
         logger.info("Reading local database: %s", args.local_db)
         local_db = read_db(args.local_db)
     else:
-        local_db = []
+        local_db = {}
 
     # Read local playlist
     if args.playlist is not None and not args.playlist_overwrite \
@@ -449,31 +639,37 @@ def main(argv: list[str] = None) -> None:
 
     # Update playlist with Youtube playlist
     logger.info("Getting playlist info: %s", args.playlists)
-    playlist_vids.extend((
-        vid for vid in itertools.chain.from_iterable(
-            map(youtube_get_ids, args.playlists)
-        ) if vid not in playlist_vids
-    ))
+    playlist_vids = list(dict.fromkeys(itertools.chain(
+        playlist_vids, youtube_get_ids_many(args.playlists)
+    )))
     logger.debug("Updated playlist: %s", playlist_vids)
 
     # Get video info
-    vidinfo: VideoInfo
+    vidinfo: Optional[VideoInfo]
     vid_path: dict[VideoInfo, Optional[str]] = {}
+    fetch: list[str] = []
     for vid in playlist_vids:
-        vidinfo = VideoInfo.from_missing(vid)
-        if local_db is not None and vidinfo in local_db:
-            vidinfo = local_db[local_db.index(vidinfo)]
+        vidinfo = local_db.get(vid)
+        if vidinfo is not None:
             logger.debug("Found video in database: %s", vidinfo)
         else:
             logger.debug("Not found in database: %s", vid)
+        if vidinfo is None or args.update_all:
+            fetch.append(vid)
 
-        if vidinfo.missing or args.update_all:
-            try:
-                vidinfo = VideoInfo.from_youtube(vid)
-                logger.debug("Got video info from Youtube: %s", vidinfo)
-            except Exception:
-                logger.debug("Video info not found on Youtube: %s", vid)
-
+    try:
+        fetched = VideoInfo.from_youtube_many(fetch)
+        logger.debug("Got video info from Youtube: %s", fetched)
+    except Exception as err:
+        # A failed request must not abort the run: fall back to the
+        # local database entries like the per-video path used to
+        logger.error("Failed to get video information: %s", err)
+        fetched = {}
+    for vid in playlist_vids:
+        vidinfo = fetched.get(vid, local_db.get(vid))
+        if vidinfo is None:
+            logger.debug("Video info not found on Youtube: %s", vid)
+            vidinfo = VideoInfo.from_missing(vid)
         if vidinfo.missing:
             logger.error("Failed to get video information for %s", vid)
         vid_path[vidinfo] = None
@@ -487,47 +683,115 @@ def main(argv: list[str] = None) -> None:
     def find_video_raw(dir_: str, vid: str) -> Optional[str]:
         """Find the path of the raw video"""
         return next((
-            k for k in listdir_abs(dir_)
-            if id_from_path(k) == vid and path.isfile(k)
+            entry.path for entry in scandir_abs(dir_)
+            if id_from_path(entry.name) == vid and entry.is_file()
         ), None)
         # name = glob.escape(f'{dir_}/{vid}') + '.*'
         # return next(glob.iglob(name), None)
 
-    # Download missing videos
-    logger.info("Downloading missing videos")
+    def index_raw_videos(dir_: str) -> dict[str, str]:
+        """Map video IDs to raw file paths with a single directory scan"""
+        if not path.isdir(dir_):
+            return {}
+        return {
+            vid: entry.path for entry in scandir_abs(dir_)
+            if (vid := id_from_path(entry.name)) is not None
+            and entry.is_file()
+        }
+
+    # Find already downloaded videos
+    raw_index = index_raw_videos(output_raw)
+    missing: list[VideoInfo] = []
     for vidinfo in vid_path:
-        file = find_video_raw(output_raw, vidinfo.vid)
+        file = raw_index.get(vidinfo.vid)
         if file is None:
-            logger.info("Downloading video: %s", vidinfo)
+            missing.append(vidinfo)
+        else:
+            vid_path[vidinfo] = file
+
+    # Destination directories for pretty names symlinks
+    dest_dirs: list[tuple[Optional[str], str]] = [(None, output)]
+    dest_dirs.extend(
+        (locale, output_locale % {'locale': locale})
+        for locale in args.locale
+    )
+    links_index = {dst: prepare_links_dir(dst) for _, dst in dest_dirs}
+
+    # Download missing videos, linking each one as soon as it lands
+    logger.info("Downloading missing videos")
+    if yt_dlp is None and missing:
+        # Subprocess mode: batched invocations amortize the yt-dlp
+        # startup cost, with the list split over --jobs subprocesses
+        vids = [vidinfo.vid for vidinfo in missing]
+        jobs = min(args.jobs, len(vids))
+        downloaded: dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(
+                    lambda chunk: youtube_dl_batch(
+                        chunk,
+                        output_raw,
+                        *args.ytdl_extra,
+                        audio_only=args.audio_only,
+                    ),
+                    (vids[start::jobs] for start in range(jobs)),
+            ):
+                downloaded.update(result)
+        for vidinfo in missing:
+            file = downloaded.get(vidinfo.vid)
+            if file is None:
+                logger.error("Failed to download video: %s", vidinfo)
+                continue
+            vid_path[vidinfo] = file
+        missing = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(
+                youtube_dl,
+                vidinfo.vid,
+                output_raw,
+                *args.ytdl_extra,
+                audio_only=args.audio_only,
+            ): vidinfo
+            for vidinfo in missing
+        }
+        for future in as_completed(futures):
+            vidinfo = futures[future]
             try:
-                youtube_dl(
-                    vidinfo.vid,
-                    output_raw,
-                    *args.ytdl_extra,
-                    audio_only=args.audio_only,
-                )
+                file = future.result()
             except subprocess.CalledProcessError:
                 logger.exception("Failed to download video: %s", vidinfo)
                 continue
-            file = find_video_raw(output_raw, vidinfo.vid)
+            if not path.isfile(file):
+                file = find_video_raw(output_raw, vidinfo.vid)
             if file is None:
                 raise Exception(f"Downloaded video not found: {vidinfo}")
-        vid_path[vidinfo] = file
+            vid_path[vidinfo] = file
+            for locale, dest_dir in dest_dirs:
+                create_symlink(vidinfo, file, dest_dir,
+                               links_index[dest_dir], locale)
     logger.debug("Playlist content: %s", vid_path)
 
-    # Create pretty names symlinks
-    for locale in itertools.chain((None,), args.locale):
-        if locale is not None:
-            dest_dir = output_locale % {'locale': locale}
-        else:
-            dest_dir = output
+    # Create pretty names symlinks for the remaining videos; each
+    # locale writes to its own directory so they can run concurrently
+    def link_all(locale: Optional[str], dest_dir: str) -> None:
+        """Link every video into one destination directory"""
         logger.info("Creating video links in %s", dest_dir)
-        create_symlinks_locale(vid_path, dest_dir, locale)
+        for vidinfo, file in vid_path.items():
+            if file is None:
+                logger.error("Video not found: %s", vidinfo)
+                continue
+            create_symlink(vidinfo, file, dest_dir,
+                           links_index[dest_dir], locale)
+
+    with ThreadPoolExecutor(
+            max_workers=min(8, len(dest_dirs))) as executor:
+        list(executor.map(lambda dest: link_all(*dest), dest_dirs))
 
     # Create locale playlist
     if args.playlist is not None:
         logger.info("Creating M3U playlist %s", args.playlist)
-        with open(args.playlist, 'w', encoding='UTF-8') as playlist_stream:
+        with open(args.playlist, 'w', encoding='UTF-8',
+                  buffering=1 << 20) as playlist_stream:
             m3u_create(
                 playlist_stream,
                 vid_path,
@@ -542,12 +806,9 @@ def main(argv: list[str] = None) -> None:
         for vidinfo in vid_path:
             if vidinfo.missing:
                 continue
-            if vidinfo not in local_db:
-                local_db.append(vidinfo)
-            elif args.update_all:
-                local_db[local_db.index(vidinfo)] = vidinfo
-        with open(args.local_db, 'w', encoding='UTF-8') as stream:
-            json.dump([k.export_db() for k in local_db], stream, indent=2)
+            if vidinfo.vid not in local_db or args.update_all:
+                local_db[vidinfo.vid] = vidinfo
+        write_db(args.local_db, local_db)
 
 
 if __name__ == '__main__':
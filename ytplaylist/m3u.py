@@ -2,18 +2,81 @@
 
 import argparse
 import enum
+import functools
 import logging
+import mmap
 import os
+import re
 import shutil
+import stat
 import tempfile
-from typing import Iterator, Optional
-from urllib.parse import quote, unquote, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import unquote, urlparse
 from os import path
-from xml.etree import ElementTree
+
+try:
+    # C-accelerated XML parser, same iterparse interface
+    from lxml import etree as ElementTree  # type: ignore
+except ImportError:
+    from xml.etree import ElementTree  # type: ignore
+
+#: Percent-encoding of each byte value, identity for unreserved chars
+#: and '/' (same safe set as urllib.parse.quote's default)
+_QUOTE_TABLE = tuple(
+    chr(byte)
+    if byte < 128 and (chr(byte).isalnum() or chr(byte) in '-_.~/')
+    else f'%{byte:02X}'
+    for byte in range(256)
+)
+_QUOTE_SAFE = re.compile(r'[A-Za-z0-9\-_.~/]*\Z')
+
+
+def _fast_quote(string: str) -> str:
+    """Table-driven percent encoder matching urllib.parse.quote
+
+    Paths needing no escaping at all are returned as-is without any
+    allocation; others go through a single pass over their UTF-8
+    bytes.
+    """
+    if _QUOTE_SAFE.match(string):
+        return string
+    return ''.join(_QUOTE_TABLE[byte] for byte in string.encode('UTF-8'))
+
+
+quote = _fast_quote
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=256)
+def _dir_entries(dir_: str) -> frozenset[str]:
+    """Cached set of a directory's entry names"""
+    try:
+        return frozenset(os.listdir(dir_ or '.'))
+    except OSError:
+        return frozenset()
+
+
+#: Memoized per-directory resolution: playlist entries mostly share
+#: their parent directories, so resolve/relativize each one only once
+_cached_realpath = functools.lru_cache(maxsize=1024)(path.realpath)
+_cached_relpath = functools.lru_cache(maxsize=1024)(path.relpath)
+
+
+def _cached_exists(file: str) -> bool:
+    """os.path.exists through the per-directory entry cache
+
+    Playlist entries mostly share a few parent directories, so one
+    listdir per directory replaces one stat syscall per line.
+    """
+    head, tail = path.split(file)
+    if not tail:
+        return path.exists(file)
+    return tail in _dir_entries(head)
+
+
 class Encoding(enum.Enum):
     """Encoding format for paths"""
     #: Normal UTF-8 path encoding
@@ -22,35 +85,65 @@ class Encoding(enum.Enum):
     URL = enum.auto()
 
 
-def encode(uri: str, dirname: str, absolute: bool = False,
-           encoding: Encoding = Encoding.NORMAL, resolve: bool = False) -> str:
+@dataclass(slots=True)
+class EncodeCtx:
+    """Per-playlist invariants of encode()"""
+    #: Absolute directory of the playlist being rewritten
+    dirname: str
+    #: Use absolute paths rather than relative
+    absolute: bool = False
+    #: Encoding format for file paths
+    encoding: Encoding = Encoding.NORMAL
+    #: Expand symlinks
+    resolve: bool = False
+
+
+def encode(uri: str, ctx: EncodeCtx) -> str:
     """Encode a given URI"""
     scheme = urlparse(uri, scheme='file').scheme
     uri_orig = uri
 
     if scheme == 'file':
         uri = uri.removeprefix('file://')
-        prefix = '' if path.isabs(uri) else dirname
+        # POSIX-only fast path, skipping path.isabs/path.join overhead
+        prefix = '' if uri.startswith('/') else ctx.dirname + '/'
 
-        if not path.exists(path.join(prefix, uri)):
+        full = prefix + uri
+        if not _cached_exists(full):
             uri = unquote(uri)
-        if not path.exists(path.join(prefix, uri)):
-            logger.error("Parsed %s as %s: file not found",
-                         uri_orig, path.join(prefix, uri))
+            full = prefix + uri
+        if not _cached_exists(full):
+            logger.error("Parsed %s as %s: file not found", uri_orig, full)
             raise Exception(f"Cannot parse URI {uri_orig}")
 
-        uri = path.join(prefix, uri)
-        if resolve:
-            uri = path.realpath(uri)
-        if not absolute:
-            uri = path.relpath(uri, start=dirname)
-        if encoding is Encoding.URL:
+        uri = full
+        if ctx.resolve:
+            head, tail = path.split(uri)
+            uri = path.join(_cached_realpath(head), tail)
+            # The entry itself may be a symlink; only then is the
+            # full per-component walk still needed
+            if path.islink(uri):
+                uri = path.realpath(uri)
+        if not ctx.absolute:
+            head, tail = path.split(uri)
+            rel_head = _cached_relpath(head, ctx.dirname)
+            uri = tail if rel_head == '.' else f'{rel_head}/{tail}'
+        if ctx.encoding is Encoding.URL:
             uri = quote(uri)
 
-    logger.debug("Parsed %s as %s", uri_orig, uri)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Parsed %s as %s", uri_orig, uri)
     return uri
 
 
+#: Classify playlist lines in one pass over the raw bytes: comments
+#: and blank lines are copied through untouched, the rest are URIs
+_LINE_RE = re.compile(rb'(?P<cmt>#[^\n]*\n?|\n)|(?P<uri>[^\n]+\n?)')
+
+#: Output lines accumulated before each joined write call
+_WRITE_BATCH = 4096
+
+
 def main_sanitize() -> None:
     """m3u_sanitize entry point"""
     parser = argparse.ArgumentParser(
@@ -93,44 +186,73 @@ def main_sanitize() -> None:
 
     for playlist_path in args.playlists:
         logger.info("Reading %s", playlist_path)
-        dirname = path.abspath(path.dirname(playlist_path))
-
-        with tempfile.TemporaryFile(mode='w+') as fdst:
-            with open(playlist_path, 'r', encoding='UTF-8') as fsrc:
-                for line in fsrc:
-                    if line.startswith('#'):
-                        fdst.write(line)
-                        continue
-
-                    line = line.removesuffix('\n')
-                    line = encode(line, dirname, args.absolute, encoding,
-                                  args.symlinks)
-                    fdst.write(line)
-                    fdst.write('\n')
-
-            fdst.seek(0)
-            with open(playlist_path, 'w', encoding='UTF-8') as output:
-                shutil.copyfileobj(fdst, output)
+        ctx = EncodeCtx(
+            dirname=path.abspath(path.dirname(playlist_path)),
+            absolute=args.absolute,
+            encoding=encoding,
+            resolve=args.symlinks,
+        )
+        if not path.getsize(playlist_path):
+            continue
+
+        # Write to a sibling file and rename over the original: the
+        # replacement is atomic and the bytes are only written once
+        # instead of bouncing through a temporary file
+        tmp_path = playlist_path + '.tmp'
+        try:
+            with open(playlist_path, 'rb') as fsrc, \
+                    mmap.mmap(fsrc.fileno(), 0,
+                              access=mmap.ACCESS_READ) as mm, \
+                    open(tmp_path, 'wb') as fdst:
+                buf: list[bytes] = []
+                for match in _LINE_RE.finditer(mm):
+                    if match.lastgroup == 'cmt':
+                        buf.append(match.group())
+                    else:
+                        line = match.group().decode('UTF-8')
+                        line = encode(line.removesuffix('\n'), ctx)
+                        buf.append(line.encode('UTF-8'))
+                        buf.append(b'\n')
+                    if len(buf) >= 2 * _WRITE_BATCH:
+                        fdst.write(b''.join(buf))
+                        buf.clear()
+                fdst.write(b''.join(buf))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        os.replace(tmp_path, playlist_path)
 
 
 def compat(playlist: str, dest_dir: str) -> None:
     """Create compatibility symlinks for playlist"""
     base = path.dirname(playlist)
-    with open(playlist, 'r', encoding='UTF-8') as stream:
-        lines = stream.readlines()
-
-    for index, line in enumerate(lines):
-        if not line.startswith('#'):
-            line = line.removesuffix('\n')
-            file_prefix = False
-            if line.startswith('file://'):
-                file_prefix = True
-                line = line.removeprefix('file://')
-
-            if path.isabs(line):
-                abs_path = True
-            else:
-                abs_path = False
+    links: list[tuple[str, str]] = []
+    if not path.getsize(playlist):
+        return
+
+    with open(playlist, 'rb') as fsrc, \
+            mmap.mmap(fsrc.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            tempfile.TemporaryFile(mode='w+b') as fdst:
+        buf: list[bytes] = []
+        for index, match in enumerate(_LINE_RE.finditer(mm)):
+            if len(buf) >= 2 * _WRITE_BATCH:
+                fdst.write(b''.join(buf))
+                buf.clear()
+            if match.lastgroup == 'cmt':
+                buf.append(match.group())
+                continue
+
+            # Classify on the raw bytes before decoding: the first byte
+            # alone tells comments (handled by the regex), file:// URLs
+            # and absolute paths apart
+            raw = match.group().removesuffix(b'\n')
+            file_prefix = raw[0] == 0x66 and raw.startswith(b'file://')
+            if file_prefix:
+                raw = raw.removeprefix(b'file://')
+            abs_path = raw[0] == 0x2f
+
+            line = raw.decode('UTF-8')
+            if not abs_path:
                 line = path.join(base, line)
 
             url_encoded = False
@@ -140,10 +262,17 @@ def compat(playlist: str, dest_dir: str) -> None:
             if not path.isfile(line):
                 raise FileNotFoundError(f"{line}: file not found")
 
-            ext = line.split('.')[-1]
-            link = path.join(dest_dir, f"{index}.{ext}")
-            target = path.normpath(path.relpath(line, dest_dir))
-            os.symlink(target, link)
+            ext = path.splitext(line)[1][1:]
+            link = f"{dest_dir}/{index}.{ext}"
+            # Resolve symlinks before computing the target: an entry
+            # already pointing into dest_dir (a re-run on a processed
+            # playlist) must link to the real file, not to itself
+            head, tail = path.split(line)
+            real = path.join(_cached_realpath(head), tail)
+            if path.islink(real):
+                real = path.realpath(real)
+            target = path.normpath(path.relpath(real, dest_dir))
+            links.append((target, path.basename(link)))
             line = path.normpath(path.relpath(link, base))
 
             if abs_path:
@@ -152,10 +281,32 @@ def compat(playlist: str, dest_dir: str) -> None:
                 line = quote(line)
             if file_prefix:
                 line = 'file://' + line
-            lines[index] = line + '\n'
-
-    with open(playlist, 'w', encoding='UTF-8') as stream:
-        stream.writelines(lines)
+            buf.append(line.encode('UTF-8'))
+            buf.append(b'\n')
+        fdst.write(b''.join(buf))
+
+        # Create all links in one batch relative to an open directory
+        # fd: the kernel only resolves the link basename per call
+        # instead of re-walking the full destination path, without
+        # touching the process-wide working directory
+        dfd = os.open(dest_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for target, name in links:
+                try:
+                    if stat.S_ISLNK(os.lstat(name, dir_fd=dfd).st_mode):
+                        os.unlink(name, dir_fd=dfd)
+                except FileNotFoundError:
+                    pass
+                os.symlink(target, name, dir_fd=dfd)
+        finally:
+            os.close(dfd)
+
+        fdst.seek(0)
+        with open(playlist, 'wb') as output:
+            shutil.copyfileobj(fdst, output)
+
+    # The created links invalidate any cached directory listing
+    _dir_entries.cache_clear()
 
 
 def main_compat() -> None:
@@ -172,12 +323,19 @@ def main_compat() -> None:
     compat(args.playlist, args.dest)
 
 
-def m3u_list(src: str) -> Iterator[str]:
-    """List paths of an M3U playlist"""
+def m3u_list(src: str, validate: bool = True) -> Iterator[str]:
+    """List paths of an M3U playlist
+
+    With validate disabled entries are yielded as-is, skipping one or
+    two stat calls per line.
+    """
     with open(src, 'r', encoding='UTF-8') as stream:
         for line in stream:
             if not line.startswith('#'):
                 line = line.removeprefix('file://').removesuffix('\n')
+                if not validate:
+                    yield line
+                    continue
                 file = line
                 if not path.isabs(line):
                     file = path.join(path.dirname(path.abspath(src)), file)
@@ -197,33 +355,42 @@ def main_list() -> None:
     parser.add_argument('playlist', help="playlist to print")
     args = parser.parse_args()
 
-    for item in m3u_list(args.playlist):
+    for item in m3u_list(args.playlist, validate=False):
         print(item)
 
 
 def move(file: str, dst: str) -> None:
-    """Update relative paths"""
-    diff = path.relpath(path.dirname(dst), path.dirname(file))
-
-    with open(file, 'r', encoding='UTF-8') as stream:
-        lines = stream.readlines()
+    """Move a playlist, updating relative paths"""
+    # Relative entries are resolved against the playlist's directory,
+    # so rewrite them from the destination back to the source
+    diff = path.relpath(path.dirname(file), path.dirname(dst))
+    if diff == '.':
+        # Same directory: the relative paths are unchanged, a rename
+        # moves the playlist without rewriting a single line
+        os.rename(file, dst)
+        return
+
+    with open(file, 'r', encoding='UTF-8') as fsrc, \
+            open(dst, 'w', encoding='UTF-8') as fdst:
+        buf: list[str] = []
+        for line in fsrc:
+            if not line.startswith('#') and line != '\n':
+                file_prefix = False
+                if line.startswith('file://'):
+                    file_prefix = True
+                    line = line.removeprefix('file://')
 
-    for index, line in enumerate(lines):
-        if not line.startswith('#'):
-            file_prefix = False
-            if line.startswith('file://'):
-                file_prefix = True
-                line = line.removeprefix('file://')
-
-            if not path.isabs(line):
-                line = path.normpath(path.join(diff, line))
-
-            if file_prefix:
-                file = 'file://' + line
-            lines[index] = line
+                if not path.isabs(line):
+                    line = path.normpath(path.join(diff, line))
 
-    with open(dst, 'w', encoding='UTF-8') as stream:
-        stream.writelines(lines)
+                if file_prefix:
+                    line = 'file://' + line
+            buf.append(line)
+            if len(buf) >= _WRITE_BATCH:
+                fdst.write(''.join(buf))
+                buf.clear()
+        fdst.write(''.join(buf))
+    os.unlink(file)
 
 
 def main_move() -> None:
@@ -240,19 +407,19 @@ def main_move() -> None:
         if path.isdir(fdst):
             fdst = path.join(fdst, path.basename(file))
         move(file, fdst)
-        shutil.move(file, fdst)
 
 
 def xspf_to_m3u(src: str, dst: str) -> None:
-    """Convert to M3U"""
-    root: Optional[ElementTree.Element] = ElementTree.parse(src).getroot()
-    assert root is not None
-    root = root.find("{http://xspf.org/ns/0/}trackList")
-    assert root is not None
+    """Convert to M3U
+
+    The XSPF file is parsed as a stream, one track in memory at a
+    time, writing M3U entries as tracks complete.
+    """
     with open(dst, 'w', encoding='UTF-8') as stream:
         stream.write('#EXTM3U\n')
-        track: Optional[ElementTree.Element]
-        for track in root.findall("{http://xspf.org/ns/0/}track"):
+        for _, track in ElementTree.iterparse(src):
+            if track.tag != '{http://xspf.org/ns/0/}track':
+                continue
             search = track.find("{http://xspf.org/ns/0/}location")
             assert search is not None and search.text is not None
             file = search.text
@@ -268,6 +435,7 @@ def xspf_to_m3u(src: str, dst: str) -> None:
             duration = int(search.text)
             stream.write(f'#EXTINF:{duration},{title}\n')
             stream.write(f'{file}\n')
+            track.clear()
 
 
 def main_xspf2m3u() -> None:
@@ -288,16 +456,14 @@ def main_xspf2m3u() -> None:
 
 
 def xspf_list(src: str) -> Iterator[str]:
-    """List XSPF playlist items"""
-    root: Optional[ElementTree.Element] = ElementTree.parse(src).getroot()
-    assert root is not None
-    root = root.find('{http://xspf.org/ns/0/}trackList')
-    assert root is not None
-    item: Optional[ElementTree.Element]
-    for item in root.findall('{http://xspf.org/ns/0/}track'):
-        item = item.find('{http://xspf.org/ns/0/}location')
+    """List XSPF playlist items as they are parsed"""
+    for _, track in ElementTree.iterparse(src):
+        if track.tag != '{http://xspf.org/ns/0/}track':
+            continue
+        item = track.find('{http://xspf.org/ns/0/}location')
         assert item is not None and item.text is not None
         yield unquote(item.text).removeprefix('file://')
+        track.clear()
 
 
 def main_xspf_list() -> None:
@@ -312,17 +478,26 @@ def main_xspf_list() -> None:
         print(item)
 
 
+def _copy_one(src: str, dst: str, file: str, force: bool) -> None:
+    """Copy a single playlist entry into dst"""
+    if not path.isabs(file):
+        file = path.join(path.dirname(src), file)
+    dst_file = path.join(dst, path.basename(file))
+    if not force and not path.isfile(dst_file):
+        logger.info("Copying %s -> %s", file, dst_file)
+        shutil.copyfile(file, dst_file)
+    else:
+        logger.debug("%s: already present", dst_file)
+
+
 def copy_files(src: str, dst: str, force: bool = False) -> None:
     """Copy files from an M3U playlist into a directory"""
-    for file in m3u_list(src):
-        if not path.isabs(file):
-            file = path.join(path.dirname(src), file)
-        dst_file = path.join(dst, path.basename(file))
-        if not force and not path.isfile(dst_file):
-            logger.info("Copying %s -> %s", file, dst_file)
-            shutil.copy(file, dst_file, follow_symlinks=True)
-        else:
-            logger.debug("%s: already present", dst_file)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in executor.map(
+                lambda file: _copy_one(src, dst, file, force),
+                m3u_list(src),
+        ):
+            pass
 
 
 def main_copy() -> None: